@@ -1,12 +1,23 @@
+import bisect
+import heapq
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
+from operator import attrgetter, is_
+from sys import intern
 from typing import List, Dict, Optional, Tuple
 
 OPEN = "OPEN"
 RESERVED_CATS = {"OBC", "SC", "ST", "EWS"}
 ALL_CATS = [OPEN, "OBC", "SC", "ST", "EWS"]
+_ORDER_GAP = 1 << 16  # spacing between priority positions, leaves room for add_student
 
-@dataclass
-class Student:
+class _StudentCache:
+    # Slots for values derived in Student.__post_init__; declared here rather than
+    # as dataclass fields so they stay out of fields()/asdict() and the constructor
+    __slots__ = ("_key", "_pref_rank")
+
+@dataclass(slots=True)
+class Student(_StudentCache):
     sid: str
     rank: int
     category: str  # "GEN" or one of RESERVED_CATS; GEN uses only OPEN seats
@@ -20,23 +31,30 @@ class Student:
     assigned_seat_type: Optional[str] = None  # OPEN or one of RESERVED_CATS
     assigned_pref_index: Optional[int] = None  # index in preferences
 
+    def __post_init__(self):
+        # rank/marks/dob/sid never change at runtime, so the key is computed once
+        # Earlier DOB means older (preferred), ISO date sorts correctly
+        self._key = (self.rank, -self.total_marks, -self.subject_marks, self.dob, self.sid)
+        # Intern branch/category codes (often read from CSV/JSON) so dict and tuple-key
+        # lookups on them compare by identity instead of character by character
+        self.category = intern(self.category)
+        self.preferences = [intern(b) for b in self.preferences]
+        self._pref_rank = {b: i for i, b in enumerate(self.preferences)}
+
     def key(self) -> Tuple:
         # Sorting/tie-breaking key: lower is higher priority
-        # Earlier DOB means older (preferred), ISO date sorts correctly
-        return (self.rank, -self.total_marks, -self.subject_marks, self.dob, self.sid)
+        return self._key
 
     def prefers(self, branch: str) -> bool:
-        if branch not in self.preferences:
+        rank = self._pref_rank.get(branch)
+        if rank is None:
             return False
         if self.assigned_branch is None:
             return True
-        return self.pref_index(branch) < self.assigned_pref_index
+        return rank < self.assigned_pref_index
 
     def pref_index(self, branch: str) -> int:
-        try:
-            return self.preferences.index(branch)
-        except ValueError:
-            return 10**9
+        return self._pref_rank.get(branch, 10**9)
 
 @dataclass
 class AdmissionSystem:
@@ -44,10 +62,130 @@ class AdmissionSystem:
     seats: Dict[str, Dict[str, int]]
     students: List[Student] = field(default_factory=list)
 
-    def _eligible_for(self, s: Student, seat_type: str) -> bool:
-        if seat_type == OPEN:
-            return True
-        return s.category == seat_type  # only same reserved category can take reserved seat
+    def __post_init__(self):
+        # The (branch, seat_type) schema is fixed for the session: fill in missing
+        # seat types up front so later updates are plain increments
+        for bs in self.seats.values():
+            for t in ALL_CATS:
+                bs.setdefault(t, 0)
+        # sid -> version, bumped whenever queued entries for that student go stale
+        self._versions: Dict[str, int] = {}
+        self._index_students()
+
+    def _index_students(self) -> None:
+        # Builds every per-student index; rerun whenever the student list changes.
+        # _indexed records exactly which Student objects the indexes describe
+        self._indexed: List[Student] = list(self.students)
+        # sid -> Student, so real-time events don't rescan the student list
+        self._by_sid: Dict[str, Student] = {s.sid: s for s in self.students}
+        if len(self._by_sid) != len(self.students):
+            # Every index below (and the allocation heaps) is keyed by sid
+            seen = set()
+            dup = next(s.sid for s in self.students if s.sid in seen or seen.add(s.sid))
+            raise ValueError(f"Duplicate student sid: {dup!r}")
+        # Sort once (keys never change) and compare students by their integer
+        # position from then on; positions are spaced so add_student can slot in
+        ordered = self._sorted_students = sorted(self.students, key=attrgetter("_key"))
+        self._order: Dict[str, int] = {s.sid: i * _ORDER_GAP for i, s in enumerate(ordered)}
+        # Inverted index: branch -> students listing it, in priority order
+        self._listers: Dict[str, List[Student]] = defaultdict(list)
+        # (branch, seat_type) -> the subset of _listers eligible for that seat type;
+        # only students of the same reserved category can take a reserved seat
+        self._listers_by_cat: Dict[Tuple[str, str], List[Student]] = defaultdict(list)
+        # sid -> (branch, seat_type) pools the student can hold, in the order they
+        # are tried: each listed branch's OPEN seat, then its reserved seat if any
+        self._choices: Dict[str, List[Tuple[str, str]]] = {}
+        for s in ordered:
+            choices = self._choices[s.sid] = self._seat_choices(s)
+            for b, t in choices:
+                if t == OPEN:
+                    self._listers[b].append(s)
+                else:
+                    self._listers_by_cat[(b, t)].append(s)
+        for b, listers in self._listers.items():
+            self._listers_by_cat[(b, OPEN)] = listers  # every lister may take an OPEN seat
+        # queues[(branch, seat_type)] -> min-heap of (order, sid, version) for eligible
+        # students; built on the first vacancy and reused across cascades
+        self.queues: Dict[Tuple[str, str], list] = {}
+
+    def _sync_students(self) -> None:
+        # students is a public list that callers may edit after construction;
+        # re-index unless it still holds the very same objects in the same order
+        # (an identity compare in C, far cheaper than re-indexing)
+        students, indexed = self.students, self._indexed
+        if len(students) != len(indexed) or not all(map(is_, students, indexed)):
+            self._index_students()
+
+    @staticmethod
+    def _seat_choices(s: Student) -> List[Tuple[str, str]]:
+        reserved = s.category in RESERVED_CATS
+        choices = []
+        for b in s.preferences:
+            choices.append((b, OPEN))
+            if reserved:
+                choices.append((b, s.category))
+        return choices
+
+    def add_student(self, s: Student) -> None:
+        # Inserts into the existing indexes instead of rebuilding them. No sync here:
+        # the student is appended to both students and _indexed, so any earlier
+        # direct edit of students is still caught by the next _sync_students
+        if s.sid in self._by_sid:
+            raise ValueError(f"Duplicate student sid: {s.sid!r}")
+        self.students.append(s)
+        self._indexed.append(s)
+        self._by_sid[s.sid] = s
+
+        by_key = attrgetter("_key")
+        ordered = self._sorted_students
+        pos = bisect.bisect_left(ordered, s._key, key=by_key)
+        ordered.insert(pos, s)
+        order = self._order
+        prev = order[ordered[pos - 1].sid] if pos > 0 else None
+        nxt = order[ordered[pos + 1].sid] if pos + 1 < len(ordered) else None
+        if nxt is None:
+            order[s.sid] = 0 if prev is None else prev + _ORDER_GAP
+        elif prev is None:
+            order[s.sid] = nxt - _ORDER_GAP
+        elif nxt - prev > 1:
+            order[s.sid] = (prev + nxt) // 2
+        else:
+            # No room left between neighbours: respace every position; built
+            # queues hold the old positions, so let them rebuild lazily
+            self._order = {x.sid: i * _ORDER_GAP for i, x in enumerate(ordered)}
+            self.queues = {}
+
+        choices = self._choices[s.sid] = self._seat_choices(s)
+        for b, t in choices:
+            if t == OPEN:
+                if b not in self._listers:
+                    self._listers_by_cat[(b, OPEN)] = self._listers[b]
+                bisect.insort(self._listers[b], s, key=by_key)
+            else:
+                bisect.insort(self._listers_by_cat[(b, t)], s, key=by_key)
+        self._push_to_queues(s, self._versions.get(s.sid, 0))
+
+    def _build_queue(self, branch: str, seat_type: str) -> list:
+        # _listers_by_cat is already in key order, which is a valid heap
+        order, versions = self._order, self._versions
+        q = self.queues[(branch, seat_type)] = [
+            (order[s.sid], s.sid, versions.get(s.sid, 0))
+            for s in self._listers_by_cat.get((branch, seat_type), ())
+        ]
+        return q
+
+    def _requeue(self, s: Student) -> None:
+        # Invalidate existing entries and push fresh ones into every queue built so far;
+        # queues built later pick the student up from _listers_by_cat
+        version = self._versions[s.sid] = self._versions.get(s.sid, 0) + 1
+        self._push_to_queues(s, version)
+
+    def _push_to_queues(self, s: Student, version: int) -> None:
+        entry = (self._order[s.sid], s.sid, version)
+        for bt in self._choices[s.sid]:
+            q = self.queues.get(bt)
+            if q is not None:
+                heapq.heappush(q, entry)
 
     def _allocate(self, s: Student, branch: str, seat_type: str) -> None:
         assert self.seats[branch][seat_type] > 0, "No seat available to allocate"
@@ -57,40 +195,74 @@ class AdmissionSystem:
         s.assigned_pref_index = s.pref_index(branch)
 
     def initial_allocation(self) -> None:
-        self.students.sort(key=lambda x: x.key())
-        for s in self.students:
-            for b in s.preferences:
-                # Try OPEN first
-                if self.seats.get(b, {}).get(OPEN, 0) > 0:
-                    self._allocate(s, b, OPEN)
+        # Student-proposing deferred acceptance: each student walks their preference
+        # list (OPEN seat first, then their reserved seat); a full seat pool keeps its
+        # best holders and sends the worst one back to propose further down their list
+        self.students.sort(key=attrgetter("_key"))
+        # Always re-index here: the sort above already costs O(N log N)
+        self._index_students()
+        order = self._order
+        seats = self.seats
+        # holders[(branch, seat_type)] -> max-heap on priority as (-order, sid)
+        holders: Dict[Tuple[str, str], list] = {}
+        next_choice: Dict[str, int] = {}
+        free = deque(self.students)
+        while free:
+            s = free.popleft()
+            choices = self._choices[s.sid]
+            i = next_choice.get(s.sid, 0)
+            while i < len(choices):
+                b, t = choices[i]
+                i += 1
+                bs = seats.get(b)
+                cap = bs.get(t, 0) if bs is not None else 0
+                if cap <= 0:
+                    continue
+                h = holders.setdefault((b, t), [])
+                entry = (-order[s.sid], s.sid)
+                if len(h) < cap:
+                    heapq.heappush(h, entry)
                     break
-                # Then try reserved (if any)
-                if s.category in RESERVED_CATS:
-                    if self.seats.get(b, {}).get(s.category, 0) > 0:
-                        self._allocate(s, b, s.category)
-                        break
+                if h[0] < entry:
+                    # Evict the worst holder, who resumes proposing after this seat
+                    _, evicted = heapq.heapreplace(h, entry)
+                    free.append(self._by_sid[evicted])
+                    break
+            next_choice[s.sid] = i
+        for (b, t), h in holders.items():
+            for _, sid in h:
+                self._allocate(self._by_sid[sid], b, t)
 
     def _best_candidate_for(self, branch: str, seat_type: str) -> Optional[Student]:
-        best = None
-        best_key = None
-        for s in self.students:
-            if branch not in s.preferences:
-                continue
-            if not self._eligible_for(s, seat_type):
-                continue
-            if not s.prefers(branch):
-                continue
-            k = s.key()
-            if best is None or k < best_key:
-                best = s
-                best_key = k
-        return best
+        # Pops from the queue; the caller is expected to allocate the returned student.
+        # The heap doubles as the cached best candidate for (branch, seat_type): a
+        # discarded entry never becomes valid again without a _requeue, so nothing
+        # is re-evaluated across cascade iterations
+        q = self.queues.get((branch, seat_type))
+        if q is None:
+            q = self._build_queue(branch, seat_type)
+        while q:
+            _, sid, version = heapq.heappop(q)
+            if version != self._versions.get(sid, 0):
+                continue  # stale entry, superseded by a requeue
+            s = self._by_sid[sid]
+            if s.prefers(branch):
+                return s
+            # Holds an equal or better seat; seats only improve until a requeue
+        return None
 
     def upgrade_and_fill(self, branch: str, seat_type: str) -> None:
-        vacancies = [(branch, seat_type)]
+        self._sync_students()
+        seats = self.seats
+        vacancies = deque([(branch, seat_type)])
         while vacancies:
-            b, t = vacancies.pop(0)
-            while self.seats.get(b, {}).get(t, 0) > 0:
+            b, t = vacancies.popleft()
+            # Resolve the branch once per vacancy; the inner loop is then a single
+            # lookup per check
+            bs = seats.get(b)
+            if bs is None:
+                continue
+            while bs.get(t, 0) > 0:
                 cand = self._best_candidate_for(b, t)
                 if cand is None:
                     break
@@ -98,19 +270,20 @@ class AdmissionSystem:
                 prev_t = cand.assigned_seat_type
 
                 # Allocate new seat
-                self.seats[b][t] -= 1
+                bs[t] -= 1
                 cand.assigned_branch = b
                 cand.assigned_seat_type = t
                 cand.assigned_pref_index = cand.pref_index(b)
 
                 # Free old seat and try to refill it
                 if prev_b is not None:
-                    self.seats[prev_b][prev_t] += 1
+                    seats[prev_b][prev_t] += 1
                     vacancies.append((prev_b, prev_t))
 
     # Real-time events
     def withdraw(self, sid: str) -> None:
-        s = next((x for x in self.students if x.sid == sid), None)
+        self._sync_students()
+        s = self._by_sid.get(sid)
         if not s or s.assigned_branch is None:
             return
         b, t = s.assigned_branch, s.assigned_seat_type
@@ -119,18 +292,23 @@ class AdmissionSystem:
         s.assigned_branch = None
         s.assigned_seat_type = None
         s.assigned_pref_index = None
+        # Unassigned students are candidates for every listed branch again
+        self._requeue(s)
         # Upgrade cascade
         self.upgrade_and_fill(b, t)
 
     def add_capacity(self, branch: str, seat_type: str, delta: int) -> None:
-        self.seats.setdefault(branch, {}).setdefault(seat_type, 0)
+        # Branches are fixed at construction; only their seat counts change
+        if seat_type not in self.seats.get(branch, ()):
+            raise ValueError(f"Unknown branch/seat type: {branch!r}/{seat_type!r}")
         self.seats[branch][seat_type] += delta
         self.upgrade_and_fill(branch, seat_type)
 
     def snapshot(self):
         # Returns sorted list of assignments (sid, branch, seat_type)
+        self._sync_students()
         return [(s.sid, s.assigned_branch, s.assigned_seat_type)
-                for s in sorted(self.students, key=lambda x: x.key())]
+                for s in self._sorted_students]
 
 # Demo usage
 if __name__ == "__main__":
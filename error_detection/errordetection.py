@@ -10,43 +10,53 @@ import binascii
 # -------------------------------
 # Function to introduce bit errors
 # -------------------------------
-def introduce_error(binary_data):
-#"""Randomly flips one bit in the binary data string"""#
-    data = list(binary_data)
-    pos = random.randint(0, len(data) - 1) # random bit position
-    data[pos] = '1' if data[pos] == '0' else '0' # flip the bit
-    return ''.join(data)
+def introduce_error(frame):
+#"""Randomly flips one bit of a bytearray in place"""#
+    pos = random.randrange(len(frame) * 8) # random bit position
+    frame[pos >> 3] ^= 0x80 >> (pos & 7) # flip the bit (MSB first)
 
 # -------------------------------
 # Parity Bit Calculation
 # -------------------------------
 def parity_bit(data):
-#"""Returns 1 if number of 1s is odd, else 0 (Even Parity)"""#
-    count = data.count('1')
-    return '0' if count % 2 == 0 else '1'
+#"""Returns 1 if number of 1s in the message bytes is odd, else 0 (Even Parity)"""#
+    return int.from_bytes(data, 'big').bit_count() & 1 # popcount
+
+def parity_many(messages):
+#"""Returns the parity bit of each bytes message in a batch"""#
+    from_bytes = int.from_bytes # bind once for the loop
+    return [from_bytes(m, 'big').bit_count() & 1 for m in messages]
 
 # -------------------------------
 # Checksum Calculation
 # -------------------------------
 def checksum(data):
-#"""Calculates simple checksum using ASCII values"""#
-    total = sum(ord(ch) for ch in data)
-    return total % 256 # 8-bit checksum
+#"""Calculates simple checksum over the message bytes"""#
+    return sum(data) & 0xFF # 8-bit checksum
+
+def checksum_many(messages):
+#"""Returns the 8-bit checksum of each bytes message in a batch"""#
+    return [sum(m) & 0xFF for m in messages]
 
 # -------------------------------
 # CRC-16 Calculation
 # -------------------------------
 def crc16(data):
-#"""Computes 16-bit CRC using binascii library"""#
-    crc = binascii.crc_hqx(data.encode(), 0xFFFF)
+#"""Computes 16-bit CRC (CCITT) of a bytes message using binascii library"""#
+    crc = binascii.crc_hqx(data, 0xFFFF)
     return format(crc, '04x') # return as hexadecimal string
 
+def crc16_many(messages):
+#"""Computes raw 16-bit CRC values for a batch of bytes messages"""#
+    crc_hqx = binascii.crc_hqx # bind once, skip per-message lookup and formatting
+    return [crc_hqx(m, 0xFFFF) for m in messages]
+
 # -------------------------------
 # Helper: Convert ASCII to Binary
 # -------------------------------
 def to_binary(data):
-#"""Converts ASCII text to binary string"""#
-    return ''.join(format(ord(ch), '08b') for ch in data)
+#"""Converts message bytes to an integer and its width in bits"""#
+    return int.from_bytes(data, 'big'), len(data) * 8
 
 # -------------------------------
 # MAIN PROGRAM
@@ -54,55 +64,58 @@ def to_binary(data):
 def main():
     print("=== Bit Error Simulation using Python ===\n")
 
-# Step 1: Input data message
-data = input("Enter a message to transmit: ").upper()
-binary_data = to_binary(data)
-print(f"\nOriginal Data (ASCII): {data}")
-print(f"Binary Data: {binary_data}")
-
-# Step 2: Calculate Parity, Checksum, and CRC
-parity = parity_bit(binary_data)
-cs = checksum(data)
-crc = crc16(data)
-
-print("\n--- Sender Side ---")
-print(f"Parity Bit: {parity}")
-print(f"Checksum: {cs}")
-print(f"CRC-16: {crc}")
-
-# Step 3: Introduce random bit error
-error_data = introduce_error(binary_data)
-print("\n--- Transmission ---")
-print(f"Erroneous Binary Data: {error_data}")
-
-# Step 4: Receiver recomputes values
-recv_parity = parity_bit(error_data)
-recv_cs = checksum(data) # Normally recomputed on received data
-recv_crc = crc16(data) # Here using same message for demo
-
-print("\n--- Receiver Side ---")
-print(f"Received Parity Bit: {recv_parity}")
-print(f"Received Checksum: {recv_cs}")
-print(f"Received CRC: {recv_crc}")
-
-# Step 5: Compare results
-print("\n--- Results ---")
-if parity != recv_parity:
-    print("❌ Parity: Error Detected!")
-else:
-    print("✅ Parity: No Error Detected.")
-
-if cs != recv_cs:
-    print("❌ Checksum: Error Detected!")
-else:
-    print("✅ Checksum: No Error Detected.")
-
-if crc != recv_crc:
-    print("❌ CRC: Error Detected!")
-else:
-    print("✅ CRC: No Error Detected.")
-
-print("\nSimulation Complete. Thank you!")
+    # Step 1: Input data message
+    data = input("Enter a message to transmit: ").upper()
+    payload = data.encode()
+    n, nbits = to_binary(payload)
+    print(f"\nOriginal Data (ASCII): {data}")
+    print(f"Binary Data: {format(n, f'0{nbits}b')}")
+
+    # Step 2: Calculate Parity, Checksum, and CRC
+    parity = parity_bit(payload)
+    cs = checksum(payload)
+    crc = crc16(payload)
+
+    print("\n--- Sender Side ---")
+    print(f"Parity Bit: {parity}")
+    print(f"Checksum: {cs}")
+    print(f"CRC-16: {crc}")
+
+    # Step 3: Introduce random bit error
+    frame = bytearray(payload)
+    introduce_error(frame)
+    error_data, _ = to_binary(frame)
+    print("\n--- Transmission ---")
+    print(f"Erroneous Binary Data: {format(error_data, f'0{nbits}b')}")
+
+    # Step 4: Receiver recomputes values
+    recv_parity = parity_bit(frame)
+    recv_cs = checksum(payload) # Normally recomputed on received data
+    recv_crc = crc16(payload) # Here using same message for demo
+
+    print("\n--- Receiver Side ---")
+    print(f"Received Parity Bit: {recv_parity}")
+    print(f"Received Checksum: {recv_cs}")
+    print(f"Received CRC: {recv_crc}")
+
+    # Step 5: Compare results
+    print("\n--- Results ---")
+    if parity != recv_parity:
+        print("❌ Parity: Error Detected!")
+    else:
+        print("✅ Parity: No Error Detected.")
+
+    if cs != recv_cs:
+        print("❌ Checksum: Error Detected!")
+    else:
+        print("✅ Checksum: No Error Detected.")
+
+    if crc != recv_crc:
+        print("❌ CRC: Error Detected!")
+    else:
+        print("✅ CRC: No Error Detected.")
+
+    print("\nSimulation Complete. Thank you!")
 
 # Run the program
 if __name__ == "__main__":